@@ -1,15 +1,13 @@
 import gspread
-from google.oauth2.service_account import Credentials
 
-from runtime_paths import get_creds_path
+from runtime_paths import get_credentials
 from ref_sheets_utils import resolve_sheet_id
 
-CREDS_PATH = str(get_creds_path())
 _SCOPES = ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
 
 
 def get_ws(ref_sheets, tab_name):
-    creds = Credentials.from_service_account_file(CREDS_PATH, scopes=_SCOPES)
+    creds = get_credentials(_SCOPES)
     gc = gspread.authorize(creds)
     sheet_id = resolve_sheet_id(ref_sheets)
     sh = gc.open_by_key(sheet_id)
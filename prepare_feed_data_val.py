@@ -1,4 +1,5 @@
 import logging
+from concurrent.futures import ThreadPoolExecutor
 
 import atexit
 from script_logger import log_start, log_end
@@ -7,16 +8,17 @@ from data_val_utils import get_ws, check_gt_threshold
 _RUN_CTX = log_start("prepare_feed_data_val")
 atexit.register(log_end, _RUN_CTX)
 
+FEED_TABS = ("SGST_OPEN_LIST", "SUPER_OPEN_LIST", "TURTLE_OPEN_LIST")
 
-def main():
-    sh1, ws1 = get_ws("FEED", "SGST_OPEN_LIST")
-    check_gt_threshold(sh1.title, ws1, "G1")
 
-    sh2, ws2 = get_ws("FEED", "SUPER_OPEN_LIST")
-    check_gt_threshold(sh2.title, ws2, "G1")
+def main():
+    # Auth + open + worksheet lookup per tab are independent round-trips, so
+    # overlap them; the per-tab check_gt_threshold calls then run in order to keep logs readable.
+    with ThreadPoolExecutor(max_workers=len(FEED_TABS)) as executor:
+        handles = list(executor.map(lambda tab: get_ws("FEED", tab), FEED_TABS))
 
-    sh3, ws3 = get_ws("FEED", "TURTLE_OPEN_LIST")
-    check_gt_threshold(sh3.title, ws3, "G1")
+    for sh, ws in handles:
+        check_gt_threshold(sh.title, ws, "G1")
 
 
 if __name__ == "__main__":
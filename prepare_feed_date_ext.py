@@ -1,4 +1,5 @@
 import logging
+from concurrent.futures import ThreadPoolExecutor
 
 import atexit
 from script_logger import log_start, log_end
@@ -7,16 +8,17 @@ from date_ext_utils import get_ws, init_date
 _RUN_CTX = log_start("prepare_feed_date_ext")
 atexit.register(log_end, _RUN_CTX)
 
+FEED_TABS = ("SGST_OPEN_LIST", "SUPER_OPEN_LIST", "TURTLE_OPEN_LIST")
 
-def main():
-    sh1, ws1 = get_ws("FEED", "SGST_OPEN_LIST")
-    init_date(sh1.title, ws1, "B1", ws1, "A2")
 
-    sh2, ws2 = get_ws("FEED", "SUPER_OPEN_LIST")
-    init_date(sh2.title, ws2, "B1", ws2, "A2")
+def main():
+    # Auth + open + worksheet lookup per tab are independent round-trips, so
+    # overlap them; the per-tab init_date calls then run in order to keep logs readable.
+    with ThreadPoolExecutor(max_workers=len(FEED_TABS)) as executor:
+        handles = list(executor.map(lambda tab: get_ws("FEED", tab), FEED_TABS))
 
-    sh3, ws3 = get_ws("FEED", "TURTLE_OPEN_LIST")
-    init_date(sh3.title, ws3, "B1", ws3, "A2")
+    for sh, ws in handles:
+        init_date(sh.title, ws, "B1", ws, "A2")
 
 
 if __name__ == "__main__":
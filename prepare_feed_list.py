@@ -1,9 +1,10 @@
 import gspread
-from google.oauth2.service_account import Credentials
 import argparse
+import re
 import time
+from operator import itemgetter
 
-from runtime_paths import get_creds_path
+from runtime_paths import get_gspread_client
 from ref_sheets_utils import resolve_sheet_id
 
 import atexit
@@ -11,7 +12,6 @@ from script_logger import log_start, log_end
 
 _RUN_CTX = log_start("prepare_feed_list")
 atexit.register(log_end, _RUN_CTX)
-CREDS_PATH = str(get_creds_path())
 
 # --- tiny retry helper (exponential backoff) for 429s on READ ops only ---
 def _retry_read(fn, *args, max_tries=5, **kwargs):
@@ -33,7 +33,12 @@ def _retry_read(fn, *args, max_tries=5, **kwargs):
             else:
                 raise
 
-def load_sheet(ref_sheets):
+def _get_client():
+    """
+    Return the process-wide gspread client (built once by runtime_paths), so the
+    open/read/write calls below share one authorized session instead of
+    re-reading creds.json and re-authorizing per call.
+    """
     # Include Sheets scopes for reads/writes + Drive (as you had)
     scope = [
         "https://www.googleapis.com/auth/spreadsheets",          # read/write
@@ -41,90 +46,151 @@ def load_sheet(ref_sheets):
         "https://www.googleapis.com/auth/drive",                 # drive access (your original)
         "https://spreadsheets.google.com/feeds",                 # legacy, retained for compatibility
     ]
-    creds = Credentials.from_service_account_file(CREDS_PATH, scopes=scope)
-    client = gspread.authorize(creds)
+    return get_gspread_client(scope)
+
+_NUMBER_RE = re.compile(r"[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?")
+
+def _as_user_entered(value):
+    """
+    Value a cell holds after writing `value` with USER_ENTERED, for the common
+    cases: numeric/boolean text is parsed, a leading apostrophe forces text.
+    Locale-formatted input (dates, currency, percentages) is left as text.
+    """
+    if not isinstance(value, str):
+        return value
+    if value.startswith("'"):
+        return value[1:]
+    text = value.strip()
+    if _NUMBER_RE.fullmatch(text):
+        return float(text) if any(c in text for c in ".eE") else int(text)
+    upper = text.upper()
+    if upper in ("TRUE", "FALSE"):
+        return upper == "TRUE"
+    return value
+
+def _sort_key(value):
+    """
+    Ascending sort key mirroring Sheets' sortRange: numbers, then text
+    (case-insensitive), then booleans, with blanks last.
+    Assumes UNFORMATTED_VALUE reads, i.e. Column A (timestamp) is a date serial
+    number and Column B (ticker) / Column C (source) are text; copy rows are
+    passed through _as_user_entered first so they compare like written cells.
+    """
+    if value is None or value == "":
+        return (3, "")
+    if isinstance(value, bool):
+        return (2, value)
+    if isinstance(value, (int, float)):
+        return (0, value)
+    return (1, str(value).lower())
+
+def load_sheet(ref_sheets):
+    client = _get_client()
     sheet_id = resolve_sheet_id(ref_sheets)
     return client.open_by_key(sheet_id)
 
-def prepare_feed_list(ref_sheets, source_tab, dest_tab):
+def prepare_feed_list(ref_sheets, source_tab, dest_tab, force_recalc=False):
     print("")
     print(f"⚙️  Preparing feed list from '{ref_sheets}'")
     print("")
     print(f"⚙️  Preparing feed list from '{source_tab}' ➡️ '{dest_tab}'")
 
     sheet = load_sheet(ref_sheets)
-    source_ws = sheet.worksheet(source_tab)
-    dest_ws = sheet.worksheet(dest_tab)
-
-    # 👉 TOUCH CELL to force sheet refresh/recalc
+    # One metadata call for all tabs instead of a spreadsheets.get per worksheet()
+    worksheets_by_title = {ws.title: ws for ws in sheet.worksheets()}
     try:
-        val = _retry_read(source_ws.acell, "A1").value
-        source_ws.update_acell("A1", val)
-        print("🔄 Touched A1 to trigger formula recalc.")
-    except Exception as e:
-        print(f"⚠️  Could not touch A1: {e}")
+        source_ws = worksheets_by_title[source_tab]
+        dest_ws = worksheets_by_title[dest_tab]
+    except KeyError as e:
+        raise gspread.exceptions.WorksheetNotFound(e.args[0]) from None
+
+    # 👉 TOUCH CELL to force sheet refresh/recalc (opt-in: rewriting A1 with its
+    # own value costs a values.update and an onEdit cascade on every run)
+    if force_recalc:
+        try:
+            val = _retry_read(source_ws.acell, "A1").value
+            if val:
+                source_ws.update_acell("A1", val)
+                print("🔄 Touched A1 to trigger formula recalc.")
+            else:
+                print("⚠️  A1 is empty; nothing to touch.")
+        except Exception as e:
+            print(f"⚠️  Could not touch A1: {e}")
 
-    # 👉 WAIT 10 seconds before starting further processing
-    print("⏳ Waiting 10 seconds for recalculation/refresh...")
-    time.sleep(10)
+        # 👉 WAIT 10 seconds for the recalc triggered by the touch to settle
+        print("⏳ Waiting 10 seconds for recalculation/refresh...")
+        time.sleep(10)
+    else:
+        print("⏭️  Skipping A1 touch (pass --recalc to force formula recalc).")
 
-    # STEP 1: Copy rows where Column D starts with "Copy" → append A, B, C to dest
-    # Read only A:D starting at row 3 (skip 2 header rows)
+    # STEP 1: Collect rows where Column D starts with "Copy" (A, B, C only)
+    # Read only A:D starting at row 3 (skip 2 header rows). The Copy/Remove
+    # filter stays client-side: GViz `tq` queries return formatted, type-coerced
+    # cells, which would break the numeric timestamp ordering used in STEP 2.
     source_data = _retry_read(source_ws.get, "A3:D", value_render_option="UNFORMATTED_VALUE") or []
-    copy_rows = [row[:3] for row in source_data if len(row) > 3 and str(row[3]).startswith("Copy")]
-
+    # Hot-loop callables bound to locals; D is a text cell, so no str() needed
+    _len = len
+    _abc = itemgetter(0, 1, 2)
+    _d = itemgetter(3)
+    # Normalised as USER_ENTERED would store them, so they compare/dedupe like
+    # the destination rows they are merged with
+    copy_rows = [[_as_user_entered(v) for v in _abc(r)] for r in source_data
+                 if _len(r) > 3 and isinstance(_d(r), str) and _d(r).startswith("Copy")]
+
+    # Destination is merged, sorted and deduped locally, then written back ONCE
+    # (no append_rows / server-side sortRange round-trips).
+    dest_data = _retry_read(dest_ws.get, "A2:C", value_render_option="UNFORMATTED_VALUE") or []
     if copy_rows:
-        dest_ws.append_rows(copy_rows, value_input_option='USER_ENTERED')
-        print(f"🧹 Step 1: Appended {len(copy_rows)} 'Copy' rows to destination.")
+        print(f"🧹 Step 1: Collected {len(copy_rows)} 'Copy' rows for destination.")
     else:
         print("⚠️  Step 1: No 'Copy' rows found.")
 
-    # STEP 2: Sort destination by Column B (ticker) first, then Column A (timestamp)
-    dest_ws.sort((2, 'asc'), (1, 'asc'))  # 2 = Column B, 1 = Column A
+    # STEP 2: Sort by Column B (ticker) first, then Column A (timestamp)
+    merged_rows = [(row + [""])[:3] for row in dest_data + copy_rows if len(row) >= 2]
+    merged_rows.sort(key=lambda r: (_sort_key(r[1]), _sort_key(r[0])))
     print("🔀 Step 2: Sorted destination by Ticker (B), then Timestamp (A).")
 
-    # STEP 3: Deduplicate based on Column B (ticker)
-    dest_data = _retry_read(dest_ws.get, "A2:C", value_render_option="UNFORMATTED_VALUE") or []
+    # STEP 3 + 4 (single pass): dedupe on Column B (ticker) and drop tickers
+    # marked "Remove" in the source sheet
+    remove_set = frozenset(_as_user_entered(r[1]) for r in source_data
+                           if _len(r) > 3 and isinstance(_d(r), str) and _d(r).startswith("Remove"))
     seen = set()
-    deduped_rows = []
-    for row in dest_data:
-        if len(row) < 2:
-            continue
+    add = seen.add
+    final_rows = []
+    append = final_rows.append
+    removed = 0
+    for row in merged_rows:
         ticker = row[1]
-        if ticker not in seen:
-            seen.add(ticker)
-            deduped_rows.append(row[:3])  # Only A, B, C
-
-    # Overwrite destination sheet from row 2 (only A-C columns)
-    dest_ws.batch_clear([f"A2:C{len(dest_data)+1}"])
-    if deduped_rows:
-        dest_ws.update(range_name="A2", values=deduped_rows, value_input_option='USER_ENTERED')
-        print(f"🗑️  Step 3: Removed duplicates by Ticker. Remaining rows: {len(deduped_rows)}")
-    else:
-        print(f"🗑️  Step 3: Destination emptied after deduplication.")
-
-    # STEP 4: Remove rows whose tickers match "Remove" in source sheet
-    remove_tickers = [row[1] for row in source_data if len(row) > 3 and str(row[3]).startswith("Remove")]
-    if remove_tickers:
-        # Filter the already written (post-dedupe) rows we have in memory
-        before = len(deduped_rows)
-        filtered_rows = [row[:3] for row in deduped_rows if len(row) > 1 and row[1] not in remove_tickers]
-        removed = before - len(filtered_rows)
-        # Clear based on previous on-sheet length (dest_data) to avoid leftovers
-        dest_ws.batch_clear([f"A2:C{len(dest_data)+1}"])
-        if filtered_rows:
-            dest_ws.update(range_name="A2", values=filtered_rows, value_input_option='USER_ENTERED')
+        if ticker in seen:
+            continue
+        add(ticker)
+        if ticker in remove_set:
+            removed += 1
+            continue
+        append(row)
+    print(f"🗑️  Step 3: Removed duplicates by Ticker. Unique tickers: {len(seen)}")
+    if remove_set:
         print(f"🗑️  Step 4: Removed {removed} rows matching 'Remove' tickers.")
     else:
         print("⚠️  Step 4: No 'Remove' tickers found.")
 
     # STEP 5: Final sort by Column C (Source), then Column B (Ticker)
-    dest_ws.sort((3, 'asc'), (2, 'asc'))  # 3 = Column C, 2 = Column B
+    final_rows.sort(key=lambda r: (_sort_key(r[2]), _sort_key(r[1])))
     print("🔀 Step 5: Final sort by Source (C), then Ticker (B).")
 
+    # Overwrite destination from row 2 (only A-C columns); clear based on the
+    # previous on-sheet length to avoid leftovers.
+    dest_ws.batch_clear([f"A2:C{len(dest_data)+1}"])
+    if final_rows:
+        dest_ws.update(range_name="A2", values=final_rows, value_input_option='USER_ENTERED')
+        print(f"📝 Wrote {len(final_rows)} rows to '{dest_tab}'.")
+    else:
+        print(f"🗑️  Destination emptied.")
+
     print("✅ Feed list preparation complete.")
     time.sleep(60)
     print("")
+    return sheet
 
 # ------------------ POST-CHECKS: specific cells & simple prints ------------------
 def _post_checks_batch(spreadsheet):
@@ -160,25 +226,18 @@ if __name__ == "__main__":
         parser.add_argument("--ref-sheets", required=True, help="Resolver key from ref_sheets.json")
         parser.add_argument("--source-sheet", required=True, help="Source tab name")
         parser.add_argument("--dest-sheet", required=True, help="Destination tab name")
+        parser.add_argument("--recalc", action=argparse.BooleanOptionalAction, default=False,
+                            help="Touch source A1 to force formula recalc before reading (default: off)")
         args = parser.parse_args()
 
-        prepare_feed_list(
+        # Reuse the already-open spreadsheet for post-checks (no second auth/open)
+        spreadsheet = prepare_feed_list(
             ref_sheets=args.ref_sheets,
             source_tab=args.source_sheet,
-            dest_tab=args.dest_sheet
+            dest_tab=args.dest_sheet,
+            force_recalc=args.recalc,
         )
-
-        # Resolve spreadsheet explicitly from the CLI sheet name
-        try:
-            spreadsheet = load_sheet(args.ref_sheets)
-        except Exception as e:
-            spreadsheet = None
-            print(f"❌ Could not open spreadsheet for ref-sheets '{args.ref_sheets}' for post-checks: {e}")
-
-        if spreadsheet is None:
-            print("❌ Could not resolve Spreadsheet object for post-checks. Skipping post-checks.")
-        else:
-            _post_checks_batch(spreadsheet)
+        _post_checks_batch(spreadsheet)
         raise SystemExit(0)
     except KeyboardInterrupt:
         print("⚠️ Interrupted by user.")
@@ -1,16 +1,13 @@
 from datetime import datetime, date
 import gspread
-from google.oauth2.service_account import Credentials
 
-from runtime_paths import get_creds_path
+from runtime_paths import get_credentials
 from ref_sheets_utils import resolve_sheet_id
 
-CREDS_PATH = str(get_creds_path())
 
 def get_ws(ref_sheets, tab_name):
-    creds = Credentials.from_service_account_file(
-        CREDS_PATH,
-        scopes=["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
+    creds = get_credentials(
+        ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
     )
     gc = gspread.authorize(creds)
     sheet_id = resolve_sheet_id(ref_sheets)
@@ -1,22 +1,24 @@
 from datetime import datetime, date
-import gspread
-from google.oauth2.service_account import Credentials
+from functools import lru_cache
 
-from runtime_paths import get_creds_path
+from runtime_paths import get_gspread_client
 from ref_sheets_utils import resolve_sheet_id
 
-CREDS_PATH = str(get_creds_path())
+def get_client():
+    return get_gspread_client(
+        ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
+    )
+
+@lru_cache(maxsize=None)
+def open_sheet(ref_sheets):
+    return get_client().open_by_key(resolve_sheet_id(ref_sheets))
+
+@lru_cache(maxsize=None)
+def open_ws(ref_sheets, tab_name):
+    return open_sheet(ref_sheets).worksheet(tab_name)
 
 def get_ws(ref_sheets, tab_name):
-    creds = Credentials.from_service_account_file(
-        CREDS_PATH,
-        scopes=["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
-    )
-    gc = gspread.authorize(creds)
-    sheet_id = resolve_sheet_id(ref_sheets)
-    sh = gc.open_by_key(sheet_id)
-    ws = sh.worksheet(tab_name)
-    return sh, ws
+    return open_sheet(ref_sheets), open_ws(ref_sheets, tab_name)
 
 def init_date(sheet_title, ws_src, src_cell, ws_dest, dest_cell):
     value = ws_src.acell(src_cell).value
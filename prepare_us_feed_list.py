@@ -1,15 +1,13 @@
 import gspread
-from google.oauth2.service_account import Credentials
 import argparse
 
-from runtime_paths import get_creds_path
+from runtime_paths import get_credentials
 from ref_sheets_utils import resolve_sheet_id
 
-CREDS_PATH = str(get_creds_path())
 
 def load_sheet(ref_sheets):
     scope = ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
-    creds = Credentials.from_service_account_file(CREDS_PATH, scopes=scope)
+    creds = get_credentials(scope)
     client = gspread.authorize(creds)
     sheet_id = resolve_sheet_id(ref_sheets)
     return client.open_by_key(sheet_id)
@@ -1,19 +1,36 @@
 from __future__ import annotations
 
 import json
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
 from runtime_paths import repo_root
 
+try:
+    import orjson as _orjson  # optional: faster parse when installed
+except ImportError:
+    _orjson = None
+
 REF_SHEETS_JSON_PATH = repo_root() / "ref_sheets.json"
 
 
+@lru_cache(maxsize=16)
+def _load_json_cached(path_str: str, mtime_ns: int) -> dict[str, Any]:
+    if _orjson is not None:
+        with open(path_str, "rb") as f:
+            return _orjson.loads(f.read())
+    with open(path_str, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
 def _load_ref_sheets_payload(path: Path | None = None) -> dict[str, Any]:
+    """
+    Load ref_sheets.json, parsed once per (path, mtime) so repeated resolves in
+    one process skip the read + JSON parse; a rewritten file is picked up.
+    """
     target = path or REF_SHEETS_JSON_PATH
-    with target.open("r", encoding="utf-8") as f:
-        payload = json.load(f)
-    return payload
+    return _load_json_cached(str(target), target.stat().st_mtime_ns)
 
 
 def _normalize_ref_key(ref_sheets: str) -> str:
@@ -31,7 +48,7 @@ def resolve_sheet_meta(ref_sheets: str, path: Path | None = None) -> dict[str, A
     for row in rows:
         row_key = str(row.get("ref-sheets", "")).strip().upper()
         if row_key == normalized_key:
-            return row
+            return dict(row)  # copy: the parsed payload is cached and shared
 
     raise ValueError(f"Unknown ref_sheets key: '{ref_sheets}'")
 
@@ -1,11 +1,22 @@
 from __future__ import annotations
 
+from functools import lru_cache
 from pathlib import Path
 import os
-from typing import Iterable, Optional
+from typing import Any, Iterable, Optional
 
-# This script has no Google Sheets dependency by design.
+# This script has no Google Sheets dependency by design
+# (google-auth / gspread are only imported lazily inside get_credentials and
+# get_gspread_client).
 
+DEFAULT_SHEETS_SCOPES = (
+    "https://spreadsheets.google.com/feeds",
+    "https://www.googleapis.com/auth/drive",
+)
+
+# Path helpers are deterministic within a process, so each distinct lookup is
+# resolved once; call <fn>.cache_clear() after changing env vars (e.g. in tests).
+@lru_cache(maxsize=None)
 def repo_root() -> Path:
     return Path(__file__).resolve().parent
 
@@ -22,7 +33,8 @@ def _first_env_path(names: Iterable[str]) -> Optional[Path]:
     return None
 
 
-def resolve_path(filename: str, env_vars: Iterable[str] = ()) -> Path:
+@lru_cache(maxsize=None)
+def resolve_path(filename: str, env_vars: tuple[str, ...] = ()) -> Path:
     """
     Resolve a file path that works both locally and in CI.
     Order of precedence:
@@ -43,6 +55,7 @@ def resolve_path(filename: str, env_vars: Iterable[str] = ()) -> Path:
     return repo_root() / filename
 
 
+@lru_cache(maxsize=None)
 def get_creds_path() -> Path:
     return resolve_path(
         "creds.json",
@@ -50,18 +63,58 @@ def get_creds_path() -> Path:
     )
 
 
+@lru_cache(maxsize=None)
+def _load_credentials(scopes: frozenset) -> Any:
+    from google.oauth2.service_account import Credentials
+
+    return Credentials.from_service_account_file(str(get_creds_path()), scopes=sorted(scopes))
+
+
+def get_credentials(scopes: Iterable[str] = DEFAULT_SHEETS_SCOPES) -> Any:
+    """
+    Return service-account Credentials for creds.json, parsed once per process
+    per distinct scope set (no repeated file read / JSON parse / RSA key import).
+    """
+    return _load_credentials(frozenset(scopes))
+
+
+@lru_cache(maxsize=None)
+def _build_gspread_client(scopes: frozenset) -> Any:
+    import gspread
+    from google.auth.transport.requests import AuthorizedSession
+
+    creds = _load_credentials(scopes)
+    session = AuthorizedSession(creds)
+    # Google APIs only gzip responses when the User-Agent also mentions gzip
+    session.headers["Accept-Encoding"] = "gzip"
+    session.headers["User-Agent"] = f"{session.headers.get('User-Agent', '')} (gzip)".strip()
+    return gspread.authorize(creds, session=session)
+
+
+def get_gspread_client(scopes: Iterable[str] = DEFAULT_SHEETS_SCOPES) -> Any:
+    """
+    Return an authorized gspread client, built once per process per distinct
+    scope set, on a session that requests gzip-compressed responses.
+    """
+    return _build_gspread_client(frozenset(scopes))
+
+
+@lru_cache(maxsize=None)
 def get_api_key_path() -> Path:
     return resolve_path("api_key.txt", env_vars=("API_KEY_PATH",))
 
 
+@lru_cache(maxsize=None)
 def get_access_token_path() -> Path:
     return resolve_path("access_token.txt", env_vars=("ACCESS_TOKEN_PATH",))
 
 
+@lru_cache(maxsize=None)
 def get_smtp_token_path() -> Path:
     return resolve_path("smtp_token.json", env_vars=("SMTP_TOKEN_PATH",))
 
 
+@lru_cache(maxsize=None)
 def get_telegram_token_path() -> Path:
     return resolve_path("telegram_token.json", env_vars=("TELEGRAM_TOKEN_PATH",))
 
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Any, Iterable
+
+from runtime_paths import get_credentials
+
+SCOPES = ("https://www.googleapis.com/auth/spreadsheets",)
+
+
+@lru_cache(maxsize=1)
+def get_service() -> Any:
+    """
+    Build the Sheets v4 service once per process (credentials are cached by
+    runtime_paths.get_credentials).
+    """
+    from googleapiclient.discovery import build
+
+    return build("sheets", "v4", credentials=get_credentials(SCOPES))
+
+
+def batch_set_cells(spreadsheet_id: str, updates: Iterable[tuple[str, Any]]) -> dict[str, Any]:
+    """
+    Write single-cell values in ONE values.batchUpdate request.
+    `updates` is an iterable of (A1 range, value) pairs, e.g. ("ALL_OLD_GTTs!R1", "FALSE").
+    Returns the API response, or an empty dict when there is nothing to write.
+    """
+    data = [{"range": rng, "values": [[value]]} for rng, value in updates]
+    if not data:
+        return {}
+    body = {"valueInputOption": "USER_ENTERED", "data": data}
+    return get_service().spreadsheets().values().batchUpdate(
+        spreadsheetId=spreadsheet_id,
+        body=body,
+    ).execute()
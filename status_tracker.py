@@ -1,4 +1,5 @@
 # status_tracker.py
+from gspread.utils import rowcol_to_a1
 from google_sheets_utils import write_rows, read_rows_from_sheet
 
 # This script has no Google Sheets dependency by design.
@@ -14,10 +15,11 @@ def update_status_in_sheet(sheet, start_row, rows_with_status):
         raise ValueError("STATUS column not found in sheet header.")
     status_col_index = header.index("STATUS") + 1
 
-    for item in rows_with_status:
-        row_num = item.get("row_number")
-        status = item.get("STATUS", "")
-        if row_num is None:
-            continue
-        # Update the STATUS cell
-        sheet.update_cell(row_num, status_col_index, status)
+    # One values.batchUpdate for all STATUS cells instead of an update_cell per row
+    data = [
+        {"range": rowcol_to_a1(item["row_number"], status_col_index), "values": [[item.get("STATUS", "")]]}
+        for item in rows_with_status
+        if item.get("row_number") is not None
+    ]
+    if data:
+        sheet.batch_update(data, value_input_option="USER_ENTERED")
@@ -4,23 +4,22 @@ from script_logger import log_start, log_end
 _RUN_CTX = log_start("zerodha_tick_size")
 atexit.register(log_end, _RUN_CTX)
 # zerodha_tick_size_no_notfound.py
-import importlib.util
 import gspread
 from kiteconnect import KiteConnect
 import sys
+import csv
+import io
 import logging
+import os
+import marshal
+import time
+from datetime import datetime, time as dtime
+from concurrent.futures import ThreadPoolExecutor
 
-from runtime_paths import get_api_key_path, get_creds_path
+from runtime_paths import get_api_key_path, get_creds_path, repo_root
+from script_logger import IST
 from ref_sheets_utils import resolve_sheet_id
 
-GSPREAD_FORMATTING_AVAILABLE = importlib.util.find_spec("gspread_formatting") is not None
-if GSPREAD_FORMATTING_AVAILABLE:
-    from gspread_formatting import format_cell_range, CellFormat, NumberFormat
-else:
-    format_cell_range = None
-    CellFormat = None
-    NumberFormat = None
-
 API_KEY_FILE = get_api_key_path()
 CREDS_JSON_PATH = str(get_creds_path())
 REF_SHEETS = "TICKER"
@@ -28,7 +27,140 @@ TICKERS_SHEET_NAME = "TICKERS_TICK_SIZE"
 ZERODHA_SHEET_NAME = "ZERODHA_TICKERS"
 
 CLEAR_SENTINEL = ""                  # what to write into cleared cells (blank)
-NUMBER_PATTERN = "0.00"              # gspread-formatting pattern for 2 decimals
+NUMBER_PATTERN = "0.00"              # numberFormat pattern for 2 decimals (columns C and E)
+LOG_LINES_LIMIT = 300                # detailed log lines kept for the summary
+
+# Kite's instrument dump changes once per trading day: cache the built map on disk.
+# marshal (not pickle/json): a flat str -> float dict loads back in one C call.
+INSTRUMENT_CACHE_DIR = repo_root()
+INSTRUMENT_CACHE_MAX_AGE_S = 12 * 3600
+# Kite publishes the day's dump in the morning: a map fetched before this IST time may
+# still be yesterday's, so it is used for this run but not cached for the rest of the day.
+INSTRUMENT_DUMP_READY_IST = dtime(8, 30)
+# Refuse to cache a map this much smaller than the previous one (truncated/partial dump).
+INSTRUMENT_CACHE_MIN_RATIO = 0.9
+
+def _instrument_cache_path():
+    return INSTRUMENT_CACHE_DIR / f"instruments_{datetime.now(IST):%Y%m%d}.marshal"
+
+def _read_instrument_cache(cache_path):
+    """Return the cached instrument map if today's file exists and is fresh, else None."""
+    try:
+        if time.time() - cache_path.stat().st_mtime >= INSTRUMENT_CACHE_MAX_AGE_S:
+            return None
+        with cache_path.open("rb") as f:
+            return marshal.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        print(f"Ignoring unreadable instrument cache {cache_path.name}: {e}")
+        return None
+
+def _previous_instrument_count(cache_path):
+    """Size of the most recent older cached map, or None if there is none readable."""
+    older = sorted(p for p in cache_path.parent.glob("instruments_*.marshal") if p != cache_path)
+    if not older:
+        return None
+    try:
+        with older[-1].open("rb") as f:
+            return len(marshal.load(f))
+    except Exception:
+        return None
+
+def _should_cache_instruments(cache_path, instrument_map):
+    """Only cache a map fetched after the dump is published and not suspiciously small."""
+    if datetime.now(IST).time() < INSTRUMENT_DUMP_READY_IST:
+        print(f"Not caching instruments: fetched before {INSTRUMENT_DUMP_READY_IST:%H:%M} IST, dump may be stale.")
+        return False
+    prev_count = _previous_instrument_count(cache_path)
+    if prev_count and len(instrument_map) < prev_count * INSTRUMENT_CACHE_MIN_RATIO:
+        print(f"Not caching instruments: {len(instrument_map)} is far below previous {prev_count}, dump may be truncated.")
+        return False
+    return True
+
+def _write_instrument_cache(cache_path, instrument_map):
+    """Atomically persist today's map and drop older instruments_* cache files."""
+    try:
+        tmp_path = cache_path.with_name(cache_path.name + ".tmp")
+        with tmp_path.open("wb") as f:
+            marshal.dump(instrument_map, f)
+        os.replace(tmp_path, cache_path)
+        for pattern in ("instruments_*.marshal", "instruments_*.pkl"):  # .pkl: earlier cache format
+            for old in cache_path.parent.glob(pattern):
+                if old != cache_path:
+                    old.unlink(missing_ok=True)
+    except OSError as e:
+        print(f"Could not write instrument cache {cache_path.name}: {e}")
+
+def _cell_data(value):
+    """Sheets API CellData for a RAW value; blank -> {} so the cell is cleared."""
+    if value == CLEAR_SENTINEL or value is None:
+        return {}
+    if isinstance(value, (int, float)):
+        return {"userEnteredValue": {"numberValue": value}}
+    return {"userEnteredValue": {"stringValue": str(value)}}
+
+def _number_format_request(sheet_id, start_row, end_row, col):
+    return {
+        "repeatCell": {
+            "range": {
+                "sheetId": sheet_id,
+                "startRowIndex": start_row,
+                "endRowIndex": end_row,
+                "startColumnIndex": col,
+                "endColumnIndex": col + 1,
+            },
+            "cell": {"userEnteredFormat": {"numberFormat": {"type": "NUMBER", "pattern": NUMBER_PATTERN}}},
+            "fields": "userEnteredFormat.numberFormat",
+        }
+    }
+
+def load_instrument_map(api_key):
+    cache_path = _instrument_cache_path()
+    instrument_map = _read_instrument_cache(cache_path)
+    if instrument_map is not None:
+        print(f"Loaded {len(instrument_map)} instruments from cache {cache_path.name}.")
+        return instrument_map
+
+    kite = KiteConnect(api_key=api_key)
+    print("Fetching instruments from Kite (this may take a while)...")
+    # Parse Kite's CSV dump directly with csv.reader and positional columns instead of
+    # kite.instruments(), which builds and type-converts a dict for every instrument.
+    resp = kite.reqsession.get(
+        f"{kite.root}/instruments",
+        headers={"X-Kite-Version": kite.kite_header_version},
+        proxies=kite.proxies,
+        verify=not kite.disable_ssl,
+        timeout=kite.timeout,
+    )  # may raise if API not accessible
+    resp.raise_for_status()
+    rows = csv.reader(io.StringIO(resp.content.decode("utf-8")))
+    header = next(rows)
+    ex_i, sym_i, ts_i = header.index("exchange"), header.index("tradingsymbol"), header.index("tick_size")
+    # Keys are interned (marshal keeps the flag, so cached maps reload interned too).
+    _intern = sys.intern
+    _join = ":".join  # one C call per key instead of f-string FORMAT_VALUE ops
+    instrument_map = {
+        _intern(_join((row[ex_i], row[sym_i]))): float(row[ts_i])
+        for row in rows
+        if len(row) > ts_i and row[ts_i]
+    }
+    print(f"Loaded {len(instrument_map)} instruments.")
+    if _should_cache_instruments(cache_path, instrument_map):
+        _write_instrument_cache(cache_path, instrument_map)
+    return instrument_map
+
+def _open_and_read_tick_sheet():
+    """
+    Open TICKERS_TICK_SIZE and read column A (last non-empty row), the current D:E
+    output and the Zerodha mapping I:J in one batch_get (single round-trip).
+    """
+    gc = gspread.service_account(filename=CREDS_JSON_PATH)
+    sheet_id = resolve_sheet_id(REF_SHEETS)
+    ss = gc.open_by_key(sheet_id)
+    tick_sheet = ss.worksheet(TICKERS_SHEET_NAME)
+    a_vals, de_vals, ij_vals = tick_sheet.batch_get(["A:A", "D:E", "I:J"])
+    return ss, tick_sheet, a_vals, de_vals, ij_vals
 
 def main():
     # ----------------------- load API key -----------------------
@@ -39,29 +171,15 @@ def main():
             return 1
         API_KEY = lines[0]
 
-    # ----------------------- build instrument map -----------------------
-    kite = KiteConnect(api_key=API_KEY)
-    print("Fetching instruments from Kite (this may take a while)...")
-    instruments = kite.instruments()  # may raise if API not accessible
-    instrument_map = {}
-    for inst in instruments:
-        try:
-            key = f"{inst['exchange']}:{inst['tradingsymbol']}"
-            ts = inst.get("tick_size")
-            if ts is not None:
-                instrument_map[key] = float(ts)
-        except Exception:
-            continue
-    print(f"Loaded {len(instrument_map)} instruments.")
+    # ----------------------- instrument map (daily disk cache) || sheet open + reads -----------------------
+    # Independent I/O waits, so overlap them: wall time is max(t_kite, t_sheet), not the sum
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        f_map = executor.submit(load_instrument_map, API_KEY)
+        f_sheet = executor.submit(_open_and_read_tick_sheet)
+        instrument_map = f_map.result()
+        ss, tick_sheet, a_vals, de_vals, ij_vals = f_sheet.result()
 
-    # ----------------------- open sheet (single) -----------------------
-    gc = gspread.service_account(filename=CREDS_JSON_PATH)
-    sheet_id = resolve_sheet_id(REF_SHEETS)
-    ss = gc.open_by_key(sheet_id)
-    tick_sheet = ss.worksheet(TICKERS_SHEET_NAME)
-
-    # ----------------------- read column A (detect last non-empty row) -----------------------
-    col_a = tick_sheet.col_values(1)  # returns up to last non-empty in col A
+    col_a = [r[0] if r else "" for r in a_vals]  # up to last non-empty in col A
     if len(col_a) <= 1:
         print("No tickers found in TICKERS_TICK_SIZE!A2:A (column A only has header or is empty). Exiting.")
         return 0
@@ -74,105 +192,107 @@ def main():
     print(f"Detected data rows A2..A{last_row} ({n_data_rows} rows).")
     print(f"Will rewrite columns C/D/E for full sheet range A2..A{write_last_row} ({write_data_rows} rows).")
 
-    # ----------------------- CLEAR C/D/E RIGHT AT START -----------------------
-    clear_range = f"C2:E{write_last_row}"
-    print(f"Clearing {clear_range} right at start ...")
-    tick_sheet.batch_clear([clear_range])
-
-    # initialize update arrays of length write_data_rows (one inner list per row)
-    updates_col_c = [[CLEAR_SENTINEL] for _ in range(write_data_rows)]
-    updates_col_d = [[CLEAR_SENTINEL] for _ in range(write_data_rows)]
-    updates_col_e = [[CLEAR_SENTINEL] for _ in range(write_data_rows)]
-
-    # ----------------------- read embedded Zerodha mapping from TICKERS_TICK_SIZE G:J and build lookup -----------------------
-    i_col = tick_sheet.col_values(9)   
-    j_col = tick_sheet.col_values(10)  
+    # initialize one [C, D, E] row per sheet row (write_data_rows rows); every row
+    # is written (blank where unresolved), so no separate clear is needed
+    updates_cde = [[CLEAR_SENTINEL, CLEAR_SENTINEL, CLEAR_SENTINEL] for _ in range(write_data_rows)]
 
-    # Build lookup: value_in_I -> first value_in_J (strip)
+    # ----------------------- build lookup from embedded Zerodha mapping (TICKERS_TICK_SIZE I:J) -----------------------
+    # Build lookup: value_in_I -> first value_in_J (alt may be blank); [1:] skips header row
+    # (I1/J1). Single pass over the (I, J) row pairs: strip once, setdefault keeps the FIRST value.
     zerodha_lookup = {}
-    max_zero = max(len(i_col), len(j_col))
-    for idx in range(1, max_zero):  # start at 1 to skip header row (I1/J1)
-        key_val = i_col[idx].strip() if idx < len(i_col) else ""
-        alt_val = j_col[idx].strip() if idx < len(j_col) else ""
-        if key_val and key_val not in zerodha_lookup:
-            zerodha_lookup[key_val] = alt_val  # alt_val may be blank
+    sd = zerodha_lookup.setdefault
+    for r in ij_vals[1:]:
+        k = r[0].strip() if r else ""
+        if k:
+            sd(k, r[1].strip() if len(r) > 1 else "")
 
     # ----------------------- process only non-empty A2:A rows -----------------------
     found_original = []
     found_with_alternate = []
     not_found_even_with_alt = []  # keeps mains for which alternate existed but alternate's tick missing
-    log_lines = []
+    log_lines = []  # only the first LOG_LINES_LIMIT are printed, so stop formatting after that
 
-    for i in range(write_data_rows):
+    # Resolve every main ticker in one C-level map() pass; rows past A's last
+    # non-empty cell stay blank (already initialized to CLEAR_SENTINEL)
+    # (tickers stripped and interned once, so dict probes can match on identity)
+    _intern = sys.intern
+    tickers = [_intern(t.strip()) for t in col_a[1:]]
+    main_ticks = list(map(instrument_map.get, tickers))
+
+    for i, (main_ticker, ts_main) in enumerate(zip(tickers, main_ticks)):
         # row number in sheet
         sheet_row = i + 2
-        main_ticker = col_a[i + 1].strip() if (i + 1) < len(col_a) else ""
         if not main_ticker:
             # leave cleared blanks (we already initialized to CLEAR_SENTINEL)
             continue
 
-        # try main ticker
-        ts_main = instrument_map.get(main_ticker)
+        # main ticker resolved
         if ts_main is not None:
             # numeric float; gspread will write numeric value
-            updates_col_c[i] = [round(ts_main, 2)]
-            updates_col_d[i] = [CLEAR_SENTINEL]
-            updates_col_e[i] = [CLEAR_SENTINEL]
+            updates_cde[i] = [round(ts_main, 2), CLEAR_SENTINEL, CLEAR_SENTINEL]
             found_original.append(main_ticker)
             continue
 
         # main not found -> try Zerodha lookup
-        log_lines.append(f"[Row {sheet_row}] Main not in instrument_map: {main_ticker}")
-        alt = zerodha_lookup.get(main_ticker, "").strip()
+        if len(log_lines) < LOG_LINES_LIMIT:
+            log_lines.append(f"[Row {sheet_row}] Main not in instrument_map: {main_ticker}")
+        alt = zerodha_lookup.get(main_ticker, "")
         if not alt:
             # no alternate found in Zerodha mapping: leave C/D/E blank
-            updates_col_c[i] = [CLEAR_SENTINEL]
-            updates_col_d[i] = [CLEAR_SENTINEL]
-            updates_col_e[i] = [CLEAR_SENTINEL]
             not_found_even_with_alt.append(main_ticker)
-            log_lines.append(f"  -> Not found in {ZERODHA_SHEET_NAME} col C")
+            if len(log_lines) < LOG_LINES_LIMIT:
+                log_lines.append(f"  -> Not found in {ZERODHA_SHEET_NAME} col C")
             continue
 
-        # we have an alternate; write it into column D
-        updates_col_c[i] = [CLEAR_SENTINEL]
-        updates_col_d[i] = [alt]
-
-        # try to find alternate in instrument_map
+        # we have an alternate (goes into column D); try to find it in instrument_map
         ts_alt = instrument_map.get(alt)
         if ts_alt is not None:
-            updates_col_e[i] = [round(ts_alt, 2)]
+            updates_cde[i] = [CLEAR_SENTINEL, alt, round(ts_alt, 2)]
             found_with_alternate.append((main_ticker, alt))
-            log_lines.append(f"  -> Found alternate '{alt}' with tick_size {ts_alt:.2f}")
+            if len(log_lines) < LOG_LINES_LIMIT:
+                log_lines.append(f"  -> Found alternate '{alt}' with tick_size {ts_alt:.2f}")
         else:
             # alternate exists in Zerodha sheet but NOT in instrument map:
             # Leave column E blank (do NOT write any sentinel). Log for summary.
-            updates_col_e[i] = [CLEAR_SENTINEL]
+            updates_cde[i] = [CLEAR_SENTINEL, alt, CLEAR_SENTINEL]
             not_found_even_with_alt.append(main_ticker)
-            log_lines.append(f"  -> Alternate '{alt}' not found in instrument_map; leaving E blank")
+            if len(log_lines) < LOG_LINES_LIMIT:
+                log_lines.append(f"  -> Alternate '{alt}' not found in instrument_map; leaving E blank")
 
     # ----------------------- batch update columns (numerics for C and E where applicable) -----------------------
-    range_c = f"C2:C{write_last_row}"
-    range_d = f"D2:D{write_last_row}"
-    range_e = f"E2:E{write_last_row}"
-
     # Validate lengths
-    assert len(updates_col_c) == write_data_rows
-    assert len(updates_col_d) == write_data_rows
-    assert len(updates_col_e) == write_data_rows
-
-    print(f"Writing updates to {range_c}, {range_d}, {range_e} ...")
-    tick_sheet.update(range_name=range_c, values=updates_col_c)
-    tick_sheet.update(range_name=range_d, values=updates_col_d)
-    tick_sheet.update(range_name=range_e, values=updates_col_e)
-
-    # ----------------------- apply number formatting (2 decimals) to C and E -----------------------
-    if GSPREAD_FORMATTING_AVAILABLE:
-        fmt_2dec = CellFormat(numberFormat=NumberFormat(type="NUMBER", pattern=NUMBER_PATTERN))
-        print("Applying number format 2 decimals to columns C and E...")
-        format_cell_range(tick_sheet, range_c, fmt_2dec)
-        format_cell_range(tick_sheet, range_e, fmt_2dec)
-    else:
-        print("Skipping number formatting because gspread-formatting is not installed.")
+    assert len(updates_cde) == write_data_rows
+
+    # Happy path: every ticker resolved directly, so D/E would be all blank. If the
+    # sheet's D:E (below the header) is already blank too, write column C only.
+    # (E is only ever set alongside an alternate in D, so checking D suffices.)
+    need_de = any(row[1] for row in updates_cde) or any(c for r in de_vals[1:] for c in r)
+    n_cols = 3 if need_de else 1
+    range_out = f"C2:E{write_last_row}" if need_de else f"C2:C{write_last_row}"
+
+    # C:E is contiguous, so one updateCells covers all written columns; the 2-decimal
+    # number format rides in the same spreadsheets.batchUpdate (1 RTT total)
+    # (format only the data rows up to last_row; rows below are always blank)
+    requests = [
+        {
+            "updateCells": {
+                "range": {
+                    "sheetId": tick_sheet.id,
+                    "startRowIndex": 1,
+                    "endRowIndex": write_last_row,
+                    "startColumnIndex": 2,           # C
+                    "endColumnIndex": 2 + n_cols,    # through E (or just C)
+                },
+                "rows": [{"values": [_cell_data(v) for v in row[:n_cols]]} for row in updates_cde],
+                "fields": "userEnteredValue",
+            }
+        },
+        _number_format_request(tick_sheet.id, 1, last_row, 2),  # C
+    ]
+    if need_de:
+        requests.append(_number_format_request(tick_sheet.id, 1, last_row, 4))  # E
+    print(f"Writing updates to {range_out} with 2-decimal format ...")
+    ss.batch_update({"requests": requests})
 
     # ----------------------- summary -----------------------
     print("\n====== Tick Size Update Summary ======")
@@ -194,8 +314,8 @@ def main():
     else:
         print(f"❌ Tick size process not completed. {len(not_found_even_with_alt)} tickers not found:")
 
-    print("\nDetailed logs (first 300 lines):")
-    for l in log_lines[:300]:
+    print(f"\nDetailed logs (first {LOG_LINES_LIMIT} lines):")
+    for l in log_lines:
         print(l)
     print("======================================")
     return 0